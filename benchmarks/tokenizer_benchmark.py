@@ -0,0 +1,101 @@
+"""Compare the NLTK and fast tokenizer paths of TextAnalyzer.
+
+Checks that both paths give identical key topics and section comparisons
+on cleaned syllabus text, then reports the time taken by each.
+
+Usage: python -m benchmarks.tokenizer_benchmark [repetitions]
+"""
+import sys
+import random
+import timeit
+from utils.pdf_processor import PDFProcessor
+from utils.text_analyzer import TextAnalyzer
+
+SAMPLE_SYLLABI = [
+    """Course Objectives: Students will learn the fundamentals of data structures,
+    including arrays, linked lists, trees and graphs. Dr. Smith teaches CS 101 at 10:30.
+    Learning Outcomes: Analyze algorithm complexity; implement state-of-the-art sorting
+    algorithms, e.g. quicksort and merge sort. Assessment: 40% exams, 30% projects,
+    1,000 points total. Prerequisites: Introductory programming (Python or Java).""",
+    """Course Content: Machine learning foundations - supervised and unsupervised learning,
+    regression, classification, clustering. Students don't need prior ML experience.
+    Grading: Homework (25%), midterm exam (35%), final project (40%). Prof. Lee holds
+    office hours Mon./Wed. Outcomes: Evaluate models, apply cross-validation, etc.""",
+    """Objectives: Introduce microeconomic theory: supply, demand, market equilibrium.
+    Topics include consumer choice, production costs, and game theory vs. market design.
+    Evaluation: weekly quizzes; two midterms; final exam worth 3.5 credit units.
+    Requirements: ECON 100 or equivalent, calculus recommended.""",
+    """Table of Contents: Introduction.........3 Grading Policy.........7 Schedule...12
+    Late work cannot be accepted after the deadline -- no exceptions. We're gonna cover
+    graphs... trees... and heaps, and you'll wanna review recursion first; lemme know
+    if you gotta miss class. Instructor: J. R. Smith, Ph.D. office hrs. are tues. and thurs.
+    at 2 p.m. in rm. 204, approx. 3 hrs. per wk. Readings: ch. 4 and vol. 2 no. 3 of the
+    text, i.e. the u.s. edition. Gimme feedback: anonymous forms, weekly -- on time.""",
+    """course description: this course introduces c. elegans genetics. lab sec. 2 meets
+    weds. at 9 a.m., see fig. 3. students who cannot attend must email dr. jones, prof.
+    of biology. topics... mutation, selection, drift. grading: labs 30, exams 70.
+    note: dot leaders.....and ellipses...are common in pdf tables of contents."""
+]
+
+
+def build_corpus(size, seed=0):
+    """Shuffle sample lines into a larger cleaned document."""
+    rng = random.Random(seed)
+    lines = [line.strip() for text in SAMPLE_SYLLABI for line in text.splitlines() if line.strip()]
+    return PDFProcessor.clean_text(' '.join(rng.choice(lines) for _ in range(size)))
+
+
+def check_equivalence(analyzer, text1, text2):
+    """Return a list of mismatches between the NLTK and fast paths."""
+    mismatches = []
+    for text in (text1, text2):
+        slow, fast = analyzer.tokenize(text), analyzer.tokenize(text, fast=True)
+        if slow != fast:
+            mismatches.append(f"tokenize: first difference at token "
+                              f"{next(i for i, pair in enumerate(zip(slow + [None], fast + [None])) if pair[0] != pair[1])}")
+        slow, fast = analyzer.extract_key_topics(text), analyzer.extract_key_topics(text, fast=True)
+        if slow != fast:
+            mismatches.append(f"extract_key_topics: {slow} != {fast}")
+
+    slow = analyzer.compare_sections(text1, text2)
+    fast = analyzer.compare_sections(text1, text2, fast=True)
+    for key in ('common', 'unique_to_first', 'unique_to_second'):
+        if set(slow[key]) != set(fast[key]):
+            mismatches.append(f"compare_sections[{key}]: {sorted(set(slow[key]) ^ set(fast[key]))}")
+    if slow['similarity_score'] != fast['similarity_score']:
+        mismatches.append(f"similarity_score: {slow['similarity_score']} != {fast['similarity_score']}")
+    return mismatches
+
+
+def main(repetitions=20):
+    analyzer = TextAnalyzer()
+    pairs = [
+        (PDFProcessor.clean_text(SAMPLE_SYLLABI[0]), PDFProcessor.clean_text(SAMPLE_SYLLABI[1])),
+        (PDFProcessor.clean_text(SAMPLE_SYLLABI[3]), PDFProcessor.clean_text(SAMPLE_SYLLABI[4])),
+        (build_corpus(200, seed=1), build_corpus(200, seed=2)),
+        (build_corpus(2000, seed=3), build_corpus(2000, seed=4))
+    ]
+
+    failed = False
+    for text1, text2 in pairs:
+        mismatches = check_equivalence(analyzer, text1, text2)
+        if mismatches:
+            failed = True
+            print("MISMATCH:\n  " + "\n  ".join(mismatches))
+
+        timings = {}
+        for fast in (False, True):
+            timings[fast] = timeit.timeit(
+                lambda: (analyzer.extract_key_topics(text1, fast=fast),
+                         analyzer.compare_sections(text1, text2, fast=fast)),
+                number=repetitions
+            ) / repetitions
+        print(f"{len(text1) + len(text2):>8} chars  nltk {timings[False] * 1000:8.2f} ms  "
+              f"fast {timings[True] * 1000:8.2f} ms  speedup {timings[False] / timings[True]:5.1f}x")
+
+    print("Outputs differ between tokenizer paths" if failed else "Outputs identical")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
@@ -1,3 +1,4 @@
+import os
 import streamlit as st
 import pandas as pd
 import json
@@ -6,7 +7,8 @@ from utils.pdf_processor import PDFProcessor
 from utils.text_analyzer import TextAnalyzer
 from utils.visualizer import Visualizer
 from utils.course_recommender import CourseRecommender
-from utils.database import save_comparison, get_comparison_history
+from utils.local_recommender import LocalRecommender
+from utils.database import save_comparison, get_comparison_history, get_history_summary, save_syllabus, get_syllabi
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,7 +29,22 @@ with open('assets/style.css') as f:
 pdf_processor = PDFProcessor()
 text_analyzer = TextAnalyzer()
 visualizer = Visualizer()
-course_recommender = CourseRecommender()
+local_recommender = LocalRecommender(text_analyzer)
+# "local" ranks stored syllabi only and never calls the OpenAI API
+recommender_mode = os.environ.get('RECOMMENDER_MODE', 'hybrid')
+if not os.environ.get('OPENAI_API_KEY'):
+    recommender_mode = 'local'
+course_recommender = CourseRecommender() if recommender_mode != 'local' else None
+
+def render_recommendations(recs):
+    """Display a list of course recommendations."""
+    for rec in recs:
+        with st.expander(f"📘 {rec['title']}"):
+            st.markdown(f"**Description:** {rec['description']}")
+            st.markdown("**Key Topics:**")
+            for topic in rec.get('key_topics', []):
+                st.markdown(f"- {topic}")
+            st.markdown(f"**Why it's relevant:** {rec['relevance']}")
 
 # Title and description
 st.title("📚 Course Syllabus Analyzer")
@@ -51,9 +68,17 @@ if file1 and file2:
         # Process PDFs
         with st.spinner("Processing syllabi..."):
             # Extract and clean text
-            text1 = pdf_processor.clean_text(pdf_processor.extract_text(file1.read()))
-            text2 = pdf_processor.clean_text(pdf_processor.extract_text(file2.read()))
-            
+            text1, stats1 = pdf_processor.extract_text_low_memory(file1)
+            text1 = pdf_processor.clean_text(text1)
+            text2, stats2 = pdf_processor.extract_text_low_memory(file2)
+            text2 = pdf_processor.clean_text(text2)
+            hash1 = local_recommender.content_hash(text1)
+            hash2 = local_recommender.content_hash(text2)
+            for name, stats in ((file1.name, stats1), (file2.name, stats2)):
+                peak = stats['peak_memory_bytes']
+                logger.info(f"Processed {name}: {stats['pages']} pages, {stats['size_bytes']} bytes, "
+                            f"peak RSS growth {'n/a' if peak is None else f'{peak / 1024:.0f} KB'}")
+
             # Extract sections
             sections1 = pdf_processor.extract_sections(text1)
             sections2 = pdf_processor.extract_sections(text2)
@@ -143,6 +168,32 @@ if file1 and file2:
         # History Tab
         with tab5:
             st.header("Comparison History")
+            try:
+                summary = get_history_summary()
+                if summary['total_comparisons']:
+                    col1, col2 = st.columns(2)
+                    col1.metric("Total Comparisons", summary['total_comparisons'])
+                    col2.metric("Average Similarity", f"{summary['average_similarity']:.2%}")
+                    
+                    st.subheader("Similarity Score Distribution")
+                    st.plotly_chart(visualizer.create_score_histogram(summary['score_histogram']))
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        st.markdown("### Most Compared Syllabi")
+                        df = pd.DataFrame(summary['most_compared'])
+                        df['average_similarity'] = df['average_similarity'].map('{:.2%}'.format)
+                        st.write(df.rename(columns={'name': 'Syllabus', 'comparisons': 'Comparisons',
+                                                    'average_similarity': 'Avg. Similarity'}))
+                    with col2:
+                        st.markdown("### Most Common Topics")
+                        st.write(pd.DataFrame(summary['top_topics']).rename(columns={
+                            'topic': 'Topic', 'comparisons': 'Comparisons', 'total_count': 'Mentions'}))
+            except Exception as e:
+                logger.error(f"Error displaying history summary: {str(e)}")
+                st.error("Could not load history summary.")
+            
+            st.subheader("Recent Comparisons")
             try:
                 history = get_comparison_history()
                 if not history:
@@ -182,10 +233,48 @@ if file1 and file2:
                         logger.error(f"Error during rerun: {str(e)}")
                         st.error("Failed to refresh the analysis. Please try uploading the files again.")
             
+            # Rank previously stored syllabi locally for an instant first answer, once per
+            # pair of uploads rather than on every rerun
+            if 'saved_syllabi' not in st.session_state:
+                st.session_state.saved_syllabi = set()
+            cached = st.session_state.get('local_recommendations')
+            if cached and cached[0] == (hash1, hash2):
+                local_recommendations = cached[1]
+            else:
+                local_recommendations = {"recommendations": [], "source": "local"}
+                try:
+                    for name, text, sections, content_hash in ((file1.name, text1, sections1, hash1),
+                                                               (file2.name, text2, sections2, hash2)):
+                        if text and content_hash not in st.session_state.saved_syllabi:
+                            save_syllabus(name=name, **local_recommender.build_profile(text, sections))
+                            st.session_state.saved_syllabi.add(content_hash)
+                    local_recommendations = local_recommender.recommend(
+                        [text1, text2], get_syllabi(), exclude=[hash1, hash2])
+                    st.session_state.local_recommendations = ((hash1, hash2), local_recommendations)
+                except Exception as e:
+                    logger.error(f"Error generating local recommendations: {str(e)}")
+            
+            quick_results = st.empty()
+            if recommender_mode != 'local' and local_recommendations["recommendations"]:
+                with quick_results.container():
+                    st.subheader("Quick Matches From Past Syllabi")
+                    st.caption("Showing related syllabi while AI recommendations are generated...")
+                    render_recommendations(local_recommendations["recommendations"])
+            
             with st.spinner("Analyzing syllabi and generating recommendations..."):
                 try:
                     # Get recommendations based on both syllabi
-                    if not text1 or not text2:
+                    if recommender_mode == 'local':
+                        recommendations = local_recommendations
+                        similarity_analysis = {
+                            "similarity_analysis": {
+                                "overall_similarity": f"Overall term similarity: {comparison['similarity_score']:.0%}",
+                                "complementary_aspects": [],
+                                "key_differences": [],
+                                "progression_path": "N/A"
+                            }
+                        }
+                    elif not text1 or not text2:
                         st.warning("Unable to process syllabi content. Please ensure both files are properly uploaded.")
                         recommendations = {"recommendations": []}
                         similarity_analysis = {
@@ -201,6 +290,12 @@ if file1 and file2:
                             text1 + "\n" + text2))
                         similarity_analysis = json.loads(course_recommender.analyze_similarity(
                             text1, text2))
+                        # Fall back to the local ranking when the API gives nothing usable
+                        if ("error" in recommendations or not recommendations.get("recommendations")) \
+                                and local_recommendations["recommendations"]:
+                            logger.warning(f"Using local recommendations: {recommendations.get('error', 'no results')}")
+                            recommendations = local_recommendations
+                    quick_results.empty()
                     
                     # Display similarity analysis
                     st.subheader("Course Similarity Analysis")
@@ -246,13 +341,9 @@ if file1 and file2:
                         if not recs:
                             st.warning("No course recommendations available. Try uploading different syllabi or click the retry button.")
                         else:
-                            for rec in recs:
-                                with st.expander(f"📘 {rec['title']}"):
-                                    st.markdown(f"**Description:** {rec['description']}")
-                                    st.markdown("**Key Topics:**")
-                                    for topic in rec.get('key_topics', []):
-                                        st.markdown(f"- {topic}")
-                                    st.markdown(f"**Why it's relevant:** {rec['relevance']}")
+                            if recommendations.get("source") == "local":
+                                st.info("These recommendations are based on previously analyzed syllabi.")
+                            render_recommendations(recs)
                 
                 except json.JSONDecodeError as e:
                     logger.error(f"JSON parsing error: {str(e)}")
@@ -285,7 +376,9 @@ if file1 and file2:
                     syllabus2_name=file2.name,
                     similarity_score=comparison['similarity_score'],
                     comparison_data=history_data,
-                    recommendations=recommendations.get('recommendations', [])
+                    recommendations=recommendations.get('recommendations', []),
+                    syllabus1_hash=hash1,
+                    syllabus2_hash=hash2
                 )
             except Exception as e:
                 logger.error(f"Error saving comparison history: {str(e)}")
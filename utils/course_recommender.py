@@ -1,15 +1,38 @@
 import os
 import json
 import logging
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError
+from utils.rate_limiter import get_rate_limiter, RateLimitExceeded, PRIORITY_NORMAL
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class CourseRecommender:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    def __init__(self, rate_limiter=None):
+        # Retries and backoff are handled by the rate limiter, not the SDK, so every
+        # attempt is charged to its buckets
+        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+
+    def _create_completion(self, prompt, max_tokens=1000, priority=PRIORITY_NORMAL):
+        """Send a completion request through the shared rate limiter."""
+        # Rough estimate of ~4 characters per token plus the completion budget
+        estimated_tokens = len(prompt) // 4 + max_tokens
+        try:
+            return self.rate_limiter.call(
+                self.client.completions.create,
+                estimated_tokens=estimated_tokens,
+                priority=priority,
+                retry_on=(APIConnectionError,),
+                model="gpt-3.5-turbo-instruct",
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=0.7
+            )
+        finally:
+            stats = self.rate_limiter.get_stats()
+            logger.info("Rate limiter stats: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
 
     def validate_json_response(self, response_text):
         """Validate JSON response from OpenAI API."""
@@ -37,7 +60,7 @@ class CourseRecommender:
             logger.error("Failed to decode JSON response")
             return False
 
-    def generate_recommendations(self, syllabus_text, num_recommendations=3):
+    def generate_recommendations(self, syllabus_text, num_recommendations=3, priority=PRIORITY_NORMAL):
         """Generate course recommendations based on syllabus content."""
         if not syllabus_text:
             logger.warning("Empty syllabus text provided")
@@ -62,11 +85,9 @@ class CourseRecommender:
 
         try:
             logger.info("Sending recommendation request to OpenAI API")
-            response = self.client.completions.create(
-                model="gpt-3.5-turbo-instruct",
-                prompt="You are a course recommendation assistant. Always respond in valid JSON format.\n\n" + json.dumps(prompt),
-                max_tokens=1000,
-                temperature=0.7
+            response = self._create_completion(
+                "You are a course recommendation assistant. Always respond in valid JSON format.\n\n" + json.dumps(prompt),
+                priority=priority
             )
             response_content = response.choices[0].message.content
             
@@ -101,6 +122,12 @@ class CourseRecommender:
                 logger.error("Invalid JSON structure in API response")
                 return '{"recommendations": [], "error": "Invalid response structure"}'
             
+        except RateLimitExceeded as e:
+            logger.error(f"Rate limited while generating recommendations: {str(e)}")
+            return json.dumps({
+                "recommendations": [],
+                "error": "The recommendation service is busy. Please wait a minute and try again."
+            })
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
             return json.dumps({
@@ -108,7 +135,7 @@ class CourseRecommender:
                 "error": f"Failed to generate recommendations: {str(e)}"
             })
 
-    def analyze_similarity(self, syllabus1_text, syllabus2_text):
+    def analyze_similarity(self, syllabus1_text, syllabus2_text, priority=PRIORITY_NORMAL):
         """Analyze similarity between two syllabi and provide detailed insights."""
         if not syllabus1_text or not syllabus2_text:
             logger.warning("Empty syllabus text provided for similarity analysis")
@@ -131,11 +158,9 @@ class CourseRecommender:
 
         try:
             logger.info("Sending similarity analysis request to OpenAI API")
-            response = self.client.completions.create(
-                model="gpt-3.5-turbo-instruct",
-                prompt="You are a syllabus analysis assistant. Always respond in valid JSON format.\n\n" + json.dumps(prompt),
-                max_tokens=1000,
-                temperature=0.7
+            response = self._create_completion(
+                "You are a syllabus analysis assistant. Always respond in valid JSON format.\n\n" + json.dumps(prompt),
+                priority=priority
             )
             response_content = response.choices[0].message.content
             
@@ -170,6 +195,16 @@ class CourseRecommender:
                 logger.error("Invalid JSON structure in API response")
                 return '{"similarity_analysis": {"overall_similarity": "Error: Invalid response structure", "complementary_aspects": [], "key_differences": [], "progression_path": "N/A"}}'
             
+        except RateLimitExceeded as e:
+            logger.error(f"Rate limited while analyzing similarity: {str(e)}")
+            return json.dumps({
+                "similarity_analysis": {
+                    "overall_similarity": "Error: The analysis service is busy. Please wait a minute and try again.",
+                    "complementary_aspects": [],
+                    "key_differences": [],
+                    "progression_path": "N/A"
+                }
+            })
         except Exception as e:
             logger.error(f"Error analyzing similarity: {str(e)}")
             return json.dumps({
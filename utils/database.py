@@ -1,8 +1,10 @@
 import os
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Text, Float
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON, Text, Float, Index, inspect, text
+from sqlalchemy.exc import IntegrityError, OperationalError, ProgrammingError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import postgresql, sqlite
 
 # Get database URL from environment
 DATABASE_URL = os.environ.get('DATABASE_URL')
@@ -23,6 +25,9 @@ class ComparisonHistory(Base):
     timestamp = Column(DateTime, default=datetime.utcnow)
     syllabus1_name = Column(String(255))
     syllabus2_name = Column(String(255))
+    # Content hashes identify the syllabi; NULL for comparisons saved before they were stored
+    syllabus1_hash = Column(String(64))
+    syllabus2_hash = Column(String(64))
     similarity_score = Column(Float)
     comparison_data = Column(JSON)
     recommendations = Column(JSON)
@@ -33,30 +38,115 @@ class ComparisonHistory(Base):
             'timestamp': self.timestamp.isoformat(),
             'syllabus1_name': self.syllabus1_name,
             'syllabus2_name': self.syllabus2_name,
+            'syllabus1_hash': self.syllabus1_hash,
+            'syllabus2_hash': self.syllabus2_hash,
             'similarity_score': self.similarity_score,
             'comparison_data': self.comparison_data,
             'recommendations': self.recommendations
         }
 
+class SyllabusDocument(Base):
+    __tablename__ = 'syllabus_documents'
+    
+    id = Column(Integer, primary_key=True)
+    # SHA-256 of the cleaned text identifies a syllabus; name is only for display
+    content_hash = Column(String(64), unique=True, index=True)
+    name = Column(String(255))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    description = Column(Text)
+    key_topics = Column(JSON)
+    term_vector = Column(JSON)
+    vector_norm = Column(Float)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'content_hash': self.content_hash,
+            'name': self.name,
+            'updated_at': self.updated_at.isoformat(),
+            'description': self.description,
+            'key_topics': self.key_topics,
+            'term_vector': self.term_vector,
+            'vector_norm': self.vector_norm
+        }
+
+# Materialized summaries of comparison_history, updated on every save_comparison
+HISTOGRAM_BUCKETS = 10
+
+class HistoryTotals(Base):
+    __tablename__ = 'history_totals'
+    
+    id = Column(Integer, primary_key=True)
+    comparison_count = Column(Integer, default=0)
+    score_sum = Column(Float, default=0.0)
+
+class SyllabusComparisonStats(Base):
+    __tablename__ = 'syllabus_comparison_stats'
+    
+    # Content hash, or "name:<filename>" for legacy history saved without hashes
+    syllabus_key = Column(String(255), primary_key=True)
+    # Most recent filename, for display only
+    name = Column(String(255))
+    comparison_count = Column(Integer, default=0, index=True)
+    score_sum = Column(Float, default=0.0)
+
+class SimilarityHistogram(Base):
+    __tablename__ = 'similarity_histogram'
+    
+    bucket = Column(Integer, primary_key=True)
+    comparison_count = Column(Integer, default=0)
+
+class TopicFrequency(Base):
+    __tablename__ = 'topic_frequency'
+    
+    topic = Column(String(255), primary_key=True)
+    comparison_count = Column(Integer, default=0)
+    total_count = Column(Integer, default=0)
+    
+    # Matches the ordering used by get_history_summary
+    __table_args__ = (Index('ix_topic_frequency_counts', 'comparison_count', 'total_count'),)
+
 # Create tables
 Base.metadata.create_all(engine)
 
+def _add_missing_columns():
+    """Add columns introduced after comparison_history was first created."""
+    columns = {column['name'] for column in inspect(engine).get_columns(ComparisonHistory.__tablename__)}
+    for column in (ComparisonHistory.syllabus1_hash, ComparisonHistory.syllabus2_hash):
+        if column.name in columns:
+            continue
+        try:
+            with engine.begin() as connection:
+                connection.execute(text(
+                    f"ALTER TABLE {ComparisonHistory.__tablename__} ADD COLUMN {column.name} VARCHAR(64)"
+                ))
+        except (OperationalError, ProgrammingError):
+            # Another worker added it first
+            pass
+
+_add_missing_columns()
+
 def get_session():
     """Get a new database session."""
     return Session()
 
-def save_comparison(syllabus1_name, syllabus2_name, similarity_score, comparison_data, recommendations):
+def save_comparison(syllabus1_name, syllabus2_name, similarity_score, comparison_data, recommendations,
+                    syllabus1_hash=None, syllabus2_hash=None):
     """Save a comparison to the database."""
     session = get_session()
     try:
         history = ComparisonHistory(
             syllabus1_name=syllabus1_name,
             syllabus2_name=syllabus2_name,
+            syllabus1_hash=syllabus1_hash,
+            syllabus2_hash=syllabus2_hash,
             similarity_score=similarity_score,
             comparison_data=comparison_data,
             recommendations=recommendations
         )
         session.add(history)
+        _update_summaries(session, [(syllabus1_hash, syllabus1_name), (syllabus2_hash, syllabus2_name)],
+                          similarity_score, comparison_data)
         session.commit()
         return history.id
     except Exception as e:
@@ -76,3 +166,185 @@ def get_comparison_history(limit=10):
         return [h.to_dict() for h in history]
     finally:
         session.close()
+
+def _increment(session, model, keys, increments, values=None):
+    """Atomically add `increments` to the row identified by `keys`, creating it if needed.
+
+    Columns in `values` are overwritten rather than added to.
+    """
+    values = values or {}
+    dialect = session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        stmt = insert(model).values(**keys, **increments, **values)
+        set_ = {column: getattr(model, column) + stmt.excluded[column] for column in increments}
+        set_.update({column: stmt.excluded[column] for column in values})
+        stmt = stmt.on_conflict_do_update(index_elements=list(keys), set_=set_)
+        session.execute(stmt)
+        return
+    row = session.get(model, tuple(keys.values()))
+    if row is None:
+        session.add(model(**keys, **increments, **values))
+    else:
+        for column, value in increments.items():
+            setattr(row, column, getattr(row, column) + value)
+        for column, value in values.items():
+            setattr(row, column, value)
+    session.flush()
+
+def _update_summaries(session, syllabi, similarity_score, comparison_data):
+    """Fold one comparison of the (content_hash, name) pairs in `syllabi` into the summary tables."""
+    score = similarity_score or 0.0
+    _increment(session, HistoryTotals, {'id': 1}, {'comparison_count': 1, 'score_sum': score})
+    # Comparing a syllabus with itself counts once
+    names = {content_hash or f"name:{name}"[:255]: name for content_hash, name in syllabi}
+    for key, name in names.items():
+        _increment(session, SyllabusComparisonStats, {'syllabus_key': key},
+                   {'comparison_count': 1, 'score_sum': score}, values={'name': name})
+    bucket = min(max(int(score * HISTOGRAM_BUCKETS), 0), HISTOGRAM_BUCKETS - 1)
+    _increment(session, SimilarityHistogram, {'bucket': bucket}, {'comparison_count': 1})
+
+    topics = {}
+    topics_comparison = (comparison_data or {}).get('topics_comparison') or {}
+    for key in ('topics1', 'topics2'):
+        for topic, count in (topics_comparison.get(key) or {}).items():
+            topics[topic[:255]] = topics.get(topic[:255], 0) + count
+    for topic, count in topics.items():
+        _increment(session, TopicFrequency, {'topic': topic}, {'comparison_count': 1, 'total_count': count})
+
+def _fold_history(session):
+    """Add every stored comparison to the (empty) summary tables."""
+    for h in session.query(ComparisonHistory).order_by(ComparisonHistory.id).yield_per(500):
+        _update_summaries(session, [(h.syllabus1_hash, h.syllabus1_name), (h.syllabus2_hash, h.syllabus2_name)],
+                          h.similarity_score, h.comparison_data)
+
+def rebuild_history_summaries():
+    """Recompute all summary tables from comparison_history."""
+    session = get_session()
+    try:
+        for model in (HistoryTotals, SyllabusComparisonStats, SimilarityHistogram, TopicFrequency):
+            session.query(model).delete()
+        # Make sure the totals row exists even when there is no history yet
+        session.add(HistoryTotals(id=1, comparison_count=0, score_sum=0.0))
+        session.flush()
+        _fold_history(session)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+def get_history_summary(top_n=10):
+    """Get aggregate history statistics from the summary tables."""
+    session = get_session()
+    try:
+        totals = session.get(HistoryTotals, 1)
+        histogram = {row.bucket: row.comparison_count for row in session.query(SimilarityHistogram).all()}
+        most_compared = session.query(SyllabusComparisonStats)\
+            .order_by(SyllabusComparisonStats.comparison_count.desc())\
+            .limit(top_n)\
+            .all()
+        top_topics = session.query(TopicFrequency)\
+            .order_by(TopicFrequency.comparison_count.desc(), TopicFrequency.total_count.desc())\
+            .limit(top_n)\
+            .all()
+
+        count = totals.comparison_count if totals else 0
+        return {
+            'total_comparisons': count,
+            'average_similarity': (totals.score_sum or 0.0) / count if count else 0.0,
+            'score_histogram': [
+                {
+                    'range': f"{bucket * 100 // HISTOGRAM_BUCKETS}-{(bucket + 1) * 100 // HISTOGRAM_BUCKETS}%",
+                    'count': histogram.get(bucket, 0)
+                }
+                for bucket in range(HISTOGRAM_BUCKETS)
+            ],
+            'most_compared': [
+                {
+                    'name': s.name,
+                    'comparisons': s.comparison_count,
+                    'average_similarity': s.score_sum / s.comparison_count if s.comparison_count else 0.0
+                }
+                for s in most_compared
+            ],
+            'top_topics': [
+                {'topic': t.topic, 'comparisons': t.comparison_count, 'total_count': t.total_count}
+                for t in top_topics
+            ]
+        }
+    finally:
+        session.close()
+
+def save_syllabus(content_hash, name, term_vector, vector_norm, key_topics, description):
+    """Store or update the term profile of an uploaded syllabus."""
+    values = {
+        'name': name,
+        'term_vector': term_vector,
+        'vector_norm': vector_norm,
+        'key_topics': key_topics,
+        'description': description,
+        'updated_at': datetime.utcnow()
+    }
+    session = get_session()
+    try:
+        dialect = session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            # Upsert so concurrent uploads of the same PDF don't conflict
+            insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = insert(SyllabusDocument).values(content_hash=content_hash, **values)
+            stmt = stmt.on_conflict_do_update(index_elements=['content_hash'], set_=values)
+            session.execute(stmt)
+        else:
+            syllabus = session.query(SyllabusDocument).filter_by(content_hash=content_hash).first()
+            if syllabus is None:
+                syllabus = SyllabusDocument(content_hash=content_hash)
+                session.add(syllabus)
+            for column, value in values.items():
+                setattr(syllabus, column, value)
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+def get_syllabi():
+    """Get the stored syllabus profiles, with only the fields needed for ranking."""
+    session = get_session()
+    try:
+        rows = session.query(
+            SyllabusDocument.content_hash,
+            SyllabusDocument.name,
+            SyllabusDocument.description,
+            SyllabusDocument.key_topics,
+            SyllabusDocument.term_vector,
+            SyllabusDocument.vector_norm
+        ).all()
+        return [row._asdict() for row in rows]
+    finally:
+        session.close()
+
+def _ensure_history_summaries():
+    """Backfill the summary tables once for history saved before they existed."""
+    session = get_session()
+    try:
+        if session.get(HistoryTotals, 1) is not None:
+            return
+        # Inserting the totals row claims the backfill; a worker starting at the
+        # same time blocks here and then fails with a conflict once we commit
+        session.add(HistoryTotals(id=1, comparison_count=0, score_sum=0.0))
+        session.flush()
+        _fold_history(session)
+        session.commit()
+    except IntegrityError:
+        # Another worker already backfilled the summaries
+        session.rollback()
+    except Exception as e:
+        session.rollback()
+        raise e
+    finally:
+        session.close()
+
+_ensure_history_summaries()
@@ -0,0 +1,94 @@
+import os
+import math
+import hashlib
+import logging
+from collections import Counter
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class LocalRecommender:
+    """Recommend previously analyzed syllabi without calling an external API.
+
+    Stored syllabi are ranked by cosine similarity of their term vectors and
+    overlap of their key topics with the uploaded syllabi. Results use the same
+    `recommendations` schema as CourseRecommender.
+    """
+
+    def __init__(self, text_analyzer, vector_size=100, topic_weight=0.3, min_score=0.05):
+        self.text_analyzer = text_analyzer
+        self.vector_size = vector_size
+        self.topic_weight = topic_weight
+        self.min_score = min_score
+
+    def build_profile(self, text, sections=None):
+        """Build the term vector, key topics and description stored for a syllabus."""
+        counts = Counter(self.text_analyzer.tokenize(text or "", fast=True))
+        term_vector = dict(counts.most_common(self.vector_size))
+        description = ""
+        if sections:
+            description = sections.get('course_objectives') or sections.get('course_content') or ""
+        description = (description or text or "")[:300].strip()
+        return {
+            'term_vector': term_vector,
+            'vector_norm': math.sqrt(sum(v * v for v in term_vector.values())),
+            'key_topics': [term for term, _ in counts.most_common(10)],
+            'description': description,
+            'content_hash': self.content_hash(text)
+        }
+
+    @staticmethod
+    def content_hash(text):
+        """Identify a syllabus by its content rather than its upload filename."""
+        return hashlib.sha256((text or "").encode('utf-8')).hexdigest()
+
+    def recommend(self, texts, corpus, num_recommendations=3, exclude=()):
+        """Rank stored syllabi against the given texts.
+
+        `corpus` is a list of syllabus dicts as returned by database.get_syllabi(),
+        and `exclude` holds content hashes of syllabi to leave out.
+        """
+        query = self.build_profile(" ".join(t for t in texts if t))
+        if not query['vector_norm']:
+            return {"recommendations": [], "source": "local"}
+
+        query_vector = query['term_vector']
+        query_topics = set(query['key_topics'])
+        excluded = set(exclude)
+
+        scored = []
+        for syllabus in corpus:
+            if syllabus['content_hash'] in excluded or not syllabus.get('vector_norm'):
+                continue
+            vector = syllabus['term_vector']
+            # Iterate over the smaller vector for the dot product
+            small, large = (vector, query_vector) if len(vector) < len(query_vector) else (query_vector, vector)
+            dot = sum(count * large.get(term, 0) for term, count in small.items())
+            cosine = dot / (query['vector_norm'] * syllabus['vector_norm'])
+
+            topics = set(syllabus.get('key_topics') or [])
+            shared = query_topics & topics
+            overlap = len(shared) / (len(query_topics | topics) + 1e-10)
+
+            score = (1 - self.topic_weight) * cosine + self.topic_weight * overlap
+            if score >= self.min_score:
+                scored.append((score, syllabus, shared))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        recommendations = []
+        for score, syllabus, shared in scored[:num_recommendations]:
+            shared_topics = [t for t in syllabus.get('key_topics') or [] if t in shared]
+            relevance = f"{score:.0%} match with your syllabi"
+            if shared_topics:
+                relevance += f", sharing topics: {', '.join(shared_topics[:5])}"
+            recommendations.append({
+                "title": os.path.splitext(syllabus['name'])[0],
+                "description": syllabus.get('description') or "Previously analyzed syllabus",
+                "key_topics": (syllabus.get('key_topics') or [])[:5],
+                "relevance": relevance
+            })
+
+        logger.info(f"Generated {len(recommendations)} local recommendations from {len(corpus)} stored syllabi")
+        return {"recommendations": recommendations, "source": "local"}
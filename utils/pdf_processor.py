@@ -1,8 +1,23 @@
+import os
+import re
 import PyPDF2
 from io import BytesIO
-import re
+
+
+class PDFLimitError(Exception):
+    """Raised when an uploaded PDF exceeds the configured size or page limits."""
+
 
 class PDFProcessor:
+    def __init__(self, max_file_size=None, max_pages=None):
+        # Keep PDF_MAX_FILE_SIZE_MB in sync with server.maxUploadSize in .streamlit/config.toml
+        if max_file_size is None:
+            max_file_size = int(os.environ.get('PDF_MAX_FILE_SIZE_MB', 25)) * 1024 * 1024
+        if max_pages is None:
+            max_pages = int(os.environ.get('PDF_MAX_PAGES', 200))
+        self.max_file_size = max_file_size
+        self.max_pages = max_pages
+
     @staticmethod
     def extract_text(pdf_file):
         """Extract text content from uploaded PDF file."""
@@ -15,6 +30,55 @@ class PDFProcessor:
         except Exception as e:
             raise Exception(f"Error processing PDF: {str(e)}")
 
+    def extract_text_low_memory(self, pdf_file):
+        """Extract text from a seekable file-like upload without copying its bytes.
+
+        Returns a tuple of (text, stats) where stats reports the file size, page
+        count and peak_memory_bytes: the largest growth of the process's current
+        RSS over its value before extraction, sampled after opening the PDF,
+        after each page and after joining the text. Short-lived allocations
+        within a single page are not seen, and concurrent uploads in the same
+        process inflate the figure. It is None where /proc is unavailable.
+        """
+        # Check the size before touching the content so oversized files are rejected early
+        size = getattr(pdf_file, 'size', None)
+        if size is None:
+            pdf_file.seek(0, os.SEEK_END)
+            size = pdf_file.tell()
+        if size > self.max_file_size:
+            raise PDFLimitError(
+                f"PDF exceeds the maximum size of {self.max_file_size / (1024 * 1024):g} MB"
+            )
+
+        baseline = _current_rss()
+        peak = baseline
+        try:
+            pdf_file.seek(0)
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            num_pages = len(pdf_reader.pages)
+            if num_pages > self.max_pages:
+                raise PDFLimitError(f"PDF has {num_pages} pages, the maximum is {self.max_pages}")
+
+            page_texts = []
+            for page in pdf_reader.pages:
+                page_texts.append(page.extract_text())
+                peak = _max_rss(peak, _current_rss())
+            # Release the parsed document before building the final string
+            del pdf_reader
+
+            text = "".join(page_texts).strip()
+            peak = _max_rss(peak, _current_rss())
+            del page_texts
+            return text, {
+                'size_bytes': size,
+                'pages': num_pages,
+                'peak_memory_bytes': None if baseline is None or peak is None else peak - baseline
+            }
+        except PDFLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"Error processing PDF: {str(e)}")
+
     @staticmethod
     def clean_text(text):
         """Clean and normalize extracted text."""
@@ -50,3 +114,18 @@ class PDFProcessor:
                 sections[section] = match.group(2).strip()
 
         return sections
+
+
+def _current_rss():
+    """Current resident set size of the process in bytes, or None if unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss(peak, sample):
+    if peak is None or sample is None:
+        return None
+    return max(peak, sample)
@@ -0,0 +1,249 @@
+import os
+import time
+import heapq
+import random
+import itertools
+import logging
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lower numbers are served first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call is still throttled after all retries are used up."""
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `capacity` units per minute."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` units are available (0 if available now)."""
+        self.refill()
+        # Never ask for more than the bucket can ever hold
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount):
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Process-wide governor for outbound LLM requests.
+
+    Combines a requests/min and a tokens/min token bucket with a cap on
+    concurrent calls. Waiting callers are served in priority order, and 429
+    responses trigger a shared, exponentially growing cooldown.
+    """
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=90000, max_concurrent=4,
+                 max_retries=3, base_backoff=1.0, max_backoff=60.0):
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrent = max_concurrent
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._condition = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._cooldown_until = 0.0
+        self._consecutive_429s = 0
+        self._stats = {
+            'queued': 0,
+            'throttled': 0,
+            'retried': 0,
+            'transient_errors': 0,
+            'completed': 0,
+            'failed': 0
+        }
+
+    def acquire(self, estimated_tokens, priority=PRIORITY_NORMAL):
+        """Block until a request slot and enough token budget are available."""
+        with self._condition:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._queue, entry)
+            waited = False
+            try:
+                while True:
+                    delay = None
+                    if self._queue[0] == entry and self._active < self.max_concurrent:
+                        delay = max(
+                            self._cooldown_until - time.monotonic(),
+                            self.request_bucket.wait_time(1),
+                            self.token_bucket.wait_time(estimated_tokens)
+                        )
+                        if delay <= 0:
+                            break
+                    if not waited:
+                        self._stats['queued'] += 1
+                        waited = True
+                    # Wake up when the budget refills or another caller finishes
+                    self._condition.wait(timeout=delay)
+            finally:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._condition.notify_all()
+
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(estimated_tokens)
+            self._active += 1
+
+    def release(self):
+        """Free the concurrency slot taken by `acquire`."""
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def call(self, func, *args, estimated_tokens=0, priority=PRIORITY_NORMAL, retry_on=(), **kwargs):
+        """Run `func` under the limiter, retrying 429s and transient errors with backoff.
+
+        429 responses extend a cooldown shared by all callers. Timeouts and
+        5xx responses, plus any exception types in `retry_on`, only back off
+        this call. Every attempt is charged to the buckets. A 429 caused by an
+        exhausted quota is raised without retrying.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(estimated_tokens, priority)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            else:
+                self._register_success()
+                self._record('completed')
+                return result
+            finally:
+                self.release()
+
+            if self._is_rate_limit_error(error) and not self._is_quota_error(error):
+                self._record('throttled')
+                backoff = self._register_throttle(error)
+                if attempt == self.max_retries:
+                    self._record('failed')
+                    raise RateLimitExceeded(
+                        f"Rate limit still exceeded after {self.max_retries} retries"
+                    ) from error
+                reason = "Rate limited by provider"
+            elif isinstance(error, retry_on) or self._is_transient_error(error):
+                self._record('transient_errors')
+                if attempt == self.max_retries:
+                    self._record('failed')
+                    raise error
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** attempt)
+                backoff += random.uniform(0, backoff / 4)
+                reason = f"Transient error ({error.__class__.__name__})"
+            else:
+                self._record('failed')
+                raise error
+
+            self._record('retried')
+            logger.warning(f"{reason}, retrying in {backoff:.1f}s "
+                           f"(attempt {attempt + 1}/{self.max_retries})")
+            if not self._is_rate_limit_error(error):
+                # 429s wait on the shared cooldown in acquire instead
+                time.sleep(backoff)
+
+    def get_stats(self):
+        """Return a snapshot of the limiter counters."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['waiting'] = len(self._queue)
+            stats['active'] = self._active
+            return stats
+
+    def _record(self, counter):
+        with self._condition:
+            self._stats[counter] += 1
+
+    def _register_throttle(self, error):
+        """Extend the shared cooldown after a 429 and return its length in seconds."""
+        with self._condition:
+            self._consecutive_429s += 1
+            backoff = self._retry_after(error)
+            if backoff is None:
+                backoff = min(self.max_backoff,
+                              self.base_backoff * 2 ** (self._consecutive_429s - 1))
+                backoff += random.uniform(0, backoff / 4)
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + backoff)
+            # The provider disagrees with our budget, so drain what we think is left
+            self.request_bucket.available = 0.0
+            return backoff
+
+    def _register_success(self):
+        with self._condition:
+            self._consecutive_429s = 0
+
+    @staticmethod
+    def _status_code(error):
+        status = getattr(error, 'status_code', None)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status
+
+    @classmethod
+    def _is_rate_limit_error(cls, error):
+        return cls._status_code(error) == 429
+
+    @classmethod
+    def _is_transient_error(cls, error):
+        # Same statuses the OpenAI SDK retries besides 429
+        status = cls._status_code(error)
+        return isinstance(error, TimeoutError) or (status is not None and (status in (408, 409) or status >= 500))
+
+    @staticmethod
+    def _is_quota_error(error):
+        """Whether a 429 means the account is out of quota rather than throttled."""
+        code = getattr(error, 'code', None)
+        body = getattr(error, 'body', None)
+        if code is None and isinstance(body, dict):
+            # The error object may be the body itself or nested under "error"
+            details = body.get('error', body)
+            code = details.get('code') if isinstance(details, dict) else None
+        return code == 'insufficient_quota'
+
+    @staticmethod
+    def _retry_after(error):
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        try:
+            return float(headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Get the shared limiter, configured from the environment on first use."""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(
+                requests_per_minute=int(os.environ.get('OPENAI_REQUESTS_PER_MINUTE', 60)),
+                tokens_per_minute=int(os.environ.get('OPENAI_TOKENS_PER_MINUTE', 90000)),
+                max_concurrent=int(os.environ.get('OPENAI_MAX_CONCURRENT', 4))
+            )
+        return _rate_limiter
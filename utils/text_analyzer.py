@@ -1,5 +1,7 @@
+import re
+import sys
 import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from nltk.tokenize import word_tokenize, sent_tokenize, NLTKWordTokenizer
 from nltk.corpus import stopwords
 from nltk.probability import FreqDist
 from collections import Counter
@@ -11,22 +13,93 @@ nltk.download('averaged_perceptron_tagger')
 nltk.download('universal_tagset')
 nltk.download('punkt_tab')
 
+# Characters PDFProcessor.clean_text keeps; text with anything else takes the NLTK path
+FAST_PATH_UNSUPPORTED = re.compile(r'[^\w\s\-.,;:]')
+
+# Samples of every construct clean_text output can contain, used to find which
+# NLTKWordTokenizer rules can fire on it
+FAST_PATH_PROBES = [
+    "a word. ", "a word.", "a, b c,d 1,000 e,", "a: b c:d 10:30 e:", "a..b c... d",
+    "a; b", "a -- b c-d x_y 3.5 e.g.", " cannot gimme gonna gotta lemme wanna ",
+]
+
+
+def _rule_guard(pattern, matches):
+    """Build a cheap test that must pass for `pattern` to match a sentence."""
+    symbols = frozenset(c for m in matches for c in m if not c.isalnum() and not c.isspace())
+    if symbols and pattern.pattern.endswith('$'):
+        # Anchored rules can only fire when the sentence ends in one of their symbols
+        return lambda s: s.rstrip()[-1:] in symbols
+    if symbols:
+        return lambda s: any(c in s for c in symbols)
+    words = frozenset(m.strip().lower() for m in matches)
+    return lambda s: any(w in s for w in words)
+
+
+def _select_rules(rules):
+    """Keep the (pattern, substitution) rules that change some probe beyond whitespace."""
+    selected = []
+    for pattern, substitution in rules:
+        matches = [m.group() for probe in FAST_PATH_PROBES for m in pattern.finditer(probe)]
+        if any(not m.isspace() for m in matches):
+            selected.append((_rule_guard(pattern, matches), pattern, substitution))
+    return selected
+
+
+# NLTKWordTokenizer's own rules, in its order, minus those that only match quotes,
+# brackets, apostrophes or symbols that never survive clean_text. The second list
+# runs after NLTK pads the text with spaces.
+FAST_PUNCTUATION_RULES = _select_rules(
+    NLTKWordTokenizer.STARTING_QUOTES + NLTKWordTokenizer.PUNCTUATION
+    + [NLTKWordTokenizer.PARENS_BRACKETS, NLTKWordTokenizer.DOUBLE_DASHES]
+)
+FAST_CONTRACTION_RULES = _select_rules(
+    NLTKWordTokenizer.ENDING_QUOTES
+    + [(pattern, r" \1 \2 ") for pattern in NLTKWordTokenizer.CONTRACTIONS2 + NLTKWordTokenizer.CONTRACTIONS3]
+)
+
+
 class TextAnalyzer:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = frozenset(sys.intern(word) for word in stopwords.words('english'))
+
+    def tokenize(self, text, fast=False):
+        """Tokenize lowercased text into alphanumeric, non-stopword tokens.
 
-    def extract_key_topics(self, text):
+        Both paths split sentences with punkt. The fast path then runs only the
+        NLTKWordTokenizer rules that can fire on text from
+        PDFProcessor.clean_text, skipping each one when a cheap check shows it
+        cannot match, so it yields the same tokens as the NLTK path. Text containing other characters always uses the NLTK path.
+        """
+        text = text.lower()
+        if not fast or FAST_PATH_UNSUPPORTED.search(text):
+            tokens = word_tokenize(text)
+            return [token for token in tokens if token.isalnum() and token not in self.stop_words]
+
+        stop_words = self.stop_words
+        tokens = []
+        for sentence in sent_tokenize(text):
+            for applies, pattern, substitution in FAST_PUNCTUATION_RULES:
+                if applies(sentence):
+                    sentence = pattern.sub(substitution, sentence)
+            sentence = " " + sentence + " "
+            for applies, pattern, substitution in FAST_CONTRACTION_RULES:
+                if applies(sentence):
+                    sentence = pattern.sub(substitution, sentence)
+            tokens.extend(token for token in sentence.split() if token.isalnum() and token not in stop_words)
+        return tokens
+
+    def extract_key_topics(self, text, fast=False):
         """Extract key topics from text using frequency analysis."""
         if not text:
             return {}
-        tokens = word_tokenize(text.lower())
-        tokens = [token for token in tokens if token.isalnum() and token not in self.stop_words]
+        tokens = self.tokenize(text, fast=fast)
         
         # Get frequency distribution
         fdist = FreqDist(tokens)
         return dict(fdist.most_common(10))
 
-    def compare_sections(self, section1, section2):
+    def compare_sections(self, section1, section2, fast=False):
         """Compare two sections and identify similarities and differences."""
         if not section1 or not section2:
             return {
@@ -36,13 +109,9 @@ class TextAnalyzer:
                 'similarity_score': 0.0
             }
             
-        # Tokenize sections using standard punkt tokenizer
-        tokens1 = set(word_tokenize(section1.lower()))
-        tokens2 = set(word_tokenize(section2.lower()))
-        
-        # Remove stop words
-        tokens1 = {t for t in tokens1 if t.isalnum() and t not in self.stop_words}
-        tokens2 = {t for t in tokens2 if t.isalnum() and t not in self.stop_words}
+        # Tokenize sections and remove stop words
+        tokens1 = set(self.tokenize(section1, fast=fast))
+        tokens2 = set(self.tokenize(section2, fast=fast))
         
         # Calculate similarities and differences
         common = tokens1.intersection(tokens2)
@@ -62,3 +62,11 @@ class Visualizer:
         
         fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 10])))
         return fig
+
+    @staticmethod
+    def create_score_histogram(score_histogram):
+        """Create a bar chart of how similarity scores are distributed."""
+        fig = px.bar(score_histogram, x='range', y='count',
+                    labels={'range': 'Similarity Score', 'count': 'Comparisons'},
+                    color_discrete_sequence=['#1f4068'])
+        return fig